@@ -5,64 +5,124 @@ This script demonstrates the NL2SQL plugin for Semantic Kernel
 using LangChain for SQL generation and execution.
 
 Usage:
-  python3 demo.py [--mode basic|advanced] [--query "your natural language query"]
+  python3 demo.py [--mode basic|advanced] [--query "your natural language query"] [--no-interpret]
 """
 
 import os
 import sys
 import argparse
 import asyncio
+import functools
 import logging
 
-import semantic_kernel as sk
-from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
-
-from src.nl2sql_plugin import register_nl2sql_plugin
-from src.utils import load_environment_variables
-from examples.advanced_example import DataAnalysisPlugin
+# Heavy dependencies (semantic_kernel, langchain, sqlalchemy, pyodbc) are imported
+# where they are first needed so --help and configuration errors return quickly
+from nl2sql_solution.utils import load_environment_variables, OPTIONAL_ENV_VARS
+from examples._queries import BASIC_QUERIES, ANALYSIS_REQUESTS
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-async def run_basic_demo(kernel, queries=None):
+@functools.lru_cache(maxsize=1)
+def get_engine():
+    """Get the pooled database engine shared by all queries in this process."""
+    from nl2sql_solution.database import create_pooled_engine
+    
+    env_vars = load_environment_variables()
+    return create_pooled_engine(env_vars["connection_string"])
+
+@functools.lru_cache(maxsize=1)
+def get_kernel():
+    """Get the Semantic Kernel with the Azure OpenAI service and NL2SQL plugin registered."""
+    import semantic_kernel as sk
+    from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+    from nl2sql_solution.nl2sql_plugin import register_nl2sql_plugin
+    
+    env_vars = load_environment_variables()
+    
+    # Initialize the Semantic Kernel
+    kernel = sk.Kernel()
+    
+    # Add Azure OpenAI chat service
+    kernel.add_service(
+        AzureChatCompletion(
+            service_id="azure-chat-gpt",
+            deployment_name=env_vars["azure_openai_deployment_name"],
+            endpoint=env_vars["azure_openai_endpoint"],
+            api_key=env_vars["azure_openai_api_key"],
+            api_version=env_vars["azure_openai_api_version"]
+        )
+    )
+    
+    # Register the NL2SQL plugin
+    register_nl2sql_plugin(
+        kernel=kernel,
+        connection_string=env_vars["connection_string"],
+        azure_openai_api_key=env_vars["azure_openai_api_key"],
+        azure_openai_endpoint=env_vars["azure_openai_endpoint"],
+        azure_openai_api_version=env_vars["azure_openai_api_version"],
+        azure_openai_deployment_name=env_vars["azure_openai_deployment_name"],
+        azure_openai_fast_deployment_name=env_vars["azure_openai_fast_deployment_name"],
+        included_tables=env_vars["included_tables"],
+        read_only=env_vars["read_only"],
+        engine=get_engine(),
+        cache_schema=True
+    )
+    
+    return kernel
+
+async def warmup_query():
+    """Open pooled connections up front so real queries skip the ODBC handshake."""
+    from nl2sql_solution.database import prewarm_pool
+    
+    await asyncio.to_thread(prewarm_pool, get_engine())
+
+async def run_basic_demo(kernel=None, queries=None):
     """Run the basic NL2SQL demo."""
+    from nl2sql_solution.semantic_cache import SemanticCachedFunction, make_cache_key
+    
+    if kernel is None:
+        kernel = get_kernel()
+    
     if not queries:
-        queries = [
-            "What are the top 5 customers by order total?",
-            "Show me all employees who are in the Sales department",
-            "What is the average product price by category?"
-        ]
-    
-    # Execute each query
-    for query in queries:
-        print(f"\n\nExecuting query: '{query}'")
-        print("-" * 50)
+        queries = BASIC_QUERIES
+    
+    env_vars = load_environment_variables()
+    
+    # Start fetching schema information in the background so it overlaps with the queries
+    schema_task = asyncio.create_task(kernel.invoke(kernel.plugins["NL2SQL"]["get_schema_info"]))
+    
+    # Wrap the NL2SQL plugin's query_database function in a semantic cache
+    cached = SemanticCachedFunction(
+        kernel,
+        kernel.plugins["NL2SQL"]["query_database"],
+        cache_key=make_cache_key(env_vars["connection_string"], env_vars["included_tables"])
+    )
+    
+    # Execute the queries concurrently; they are independent LLM round-trips
+    # (similar, previously seen queries are served from the cache)
+    results = await asyncio.gather(*[cached.invoke(query) for query in queries], return_exceptions=True)
+    
+    # Print each result
+    for query, result in zip(queries, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error executing query: {str(result)}")
+            body = f"Error: {str(result)}"
+        else:
+            body = f"Result:\n{result}"
         
-        try:
-            # Get the NL2SQL plugin's query_database function
-            query_database_function = kernel.plugins["NL2SQL"]["query_database"]
-            
-            # Execute the query
-            result = await kernel.invoke(query_database_function, query)
-            
-            # Print the result
-            print(f"Result:\n{result}")
-            
-        except Exception as e:
-            logger.error(f"Error executing query: {str(e)}")
-            print(f"Error: {str(e)}")
+        # Emit each query's block with a single write
+        sys.stdout.write(f"\n\nExecuting query: '{query}'\n{'-' * 50}\n{body}\n")
+    sys.stdout.flush()
     
     # Get schema information
     print("\n\nGetting schema information:")
     print("-" * 50)
     
     try:
-        # Get the NL2SQL plugin's get_schema_info function
-        get_schema_info_function = kernel.plugins["NL2SQL"]["get_schema_info"]
-        
-        # Get the schema information
-        schema_info = await kernel.invoke(get_schema_info_function)
+        # Get the schema information fetched in the background
+        schema_info = await schema_task
         
         # Print the schema information
         print(f"Schema Information:\n{schema_info}")
@@ -71,37 +131,40 @@ async def run_basic_demo(kernel, queries=None):
         logger.error(f"Error getting schema information: {str(e)}")
         print(f"Error: {str(e)}")
 
-async def run_advanced_demo(kernel, queries=None):
-    """Run the advanced NL2SQL demo with data analysis."""
+async def run_advanced_demo(kernel=None, queries=None, interpret=True):
+    """Run the advanced NL2SQL demo with data analysis (optionally skipping interpretation)."""
+    from examples.advanced_example import DataAnalysisPlugin
+    
+    if kernel is None:
+        kernel = get_kernel()
+    
     # Register the data analysis plugin
     data_analysis_plugin = DataAnalysisPlugin(kernel)
     kernel.add_plugin(data_analysis_plugin, "DataAnalysis")
     
     if not queries:
-        queries = [
-            "Analyze sales trends over the last quarter and identify top-performing products",
-            "Investigate customer churn patterns and suggest retention strategies",
-            "Evaluate employee performance across departments and identify areas for improvement"
-        ]
-    
-    # Process each analysis request
-    for request in queries:
-        print(f"\n\nProcessing analysis request: '{request}'")
-        print("-" * 80)
+        queries = ANALYSIS_REQUESTS
+    
+    # Run the NL2SQL queries concurrently
+    query_database_function = kernel.plugins["NL2SQL"]["query_database"]
+    query_results = await asyncio.gather(
+        *[kernel.invoke(query_database_function, query=request) for request in queries],
+        return_exceptions=True
+    )
+    
+    # Stream each interpretation to stdout as it is generated
+    for request, query_result in zip(queries, query_results):
+        header = f"\n\nProcessing analysis request: '{request}'\n{'-' * 80}\n"
+        
+        if isinstance(query_result, Exception):
+            logger.error(f"Error processing analysis request: {str(query_result)}")
+            sys.stdout.write(f"{header}Error: {str(query_result)}\n")
+            continue
         
-        try:
-            # Get the data analysis function
-            analyze_data_function = kernel.plugins["DataAnalysis"]["analyze_data"]
-            
-            # Execute the analysis
-            result = await kernel.invoke(analyze_data_function, request)
-            
-            # Print the result
-            print(f"Result:\n{result}")
-            
-        except Exception as e:
-            logger.error(f"Error processing analysis request: {str(e)}")
-            print(f"Error: {str(e)}")
+        sys.stdout.write(f"{header}Result:\n")
+        async for chunk in data_analysis_plugin.stream_analysis(request, str(query_result), interpret=interpret):
+            print(chunk, end="", flush=True)
+        print()
 
 async def main():
     """Run the demo."""
@@ -110,6 +173,8 @@ async def main():
     parser.add_argument('--mode', choices=['basic', 'advanced'], default='basic',
                       help='Demo mode: basic (simple queries) or advanced (data analysis)')
     parser.add_argument('--query', type=str, help='Natural language query to execute')
+    parser.add_argument('--interpret', action=argparse.BooleanOptionalAction, default=True,
+                      help='Advanced mode: interpret query results with a second LLM call (default: on)')
     args = parser.parse_args()
     
     # Load environment variables
@@ -117,37 +182,17 @@ async def main():
     
     # Check for required configuration
     missing_vars = [k for k, v in env_vars.items() 
-                    if v is None and k not in ["included_tables", "read_only"]]
+                    if v is None and k not in OPTIONAL_ENV_VARS]
     if missing_vars:
         print(f"Missing required configuration: {', '.join(missing_vars)}")
         print("Please set these variables in the config/.env file.")
         sys.exit(1)
     
-    # Initialize the Semantic Kernel
-    kernel = sk.Kernel()
-    
-    # Add Azure OpenAI chat service
-    kernel.add_service(
-        AzureChatCompletion(
-            service_id="azure-chat-gpt",
-            deployment_name=env_vars["azure_openai_deployment_name"],
-            endpoint=env_vars["azure_openai_endpoint"],
-            api_key=env_vars["azure_openai_api_key"],
-            api_version=env_vars["azure_openai_api_version"]
-        )
-    )
-    
-    # Register the NL2SQL plugin
-    register_nl2sql_plugin(
-        kernel=kernel,
-        connection_string=env_vars["connection_string"],
-        azure_openai_api_key=env_vars["azure_openai_api_key"],
-        azure_openai_endpoint=env_vars["azure_openai_endpoint"],
-        azure_openai_api_version=env_vars["azure_openai_api_version"],
-        azure_openai_deployment_name=env_vars["azure_openai_deployment_name"],
-        included_tables=env_vars["included_tables"],
-        read_only=env_vars["read_only"]
-    )
+    # Warm up the connection pool while the kernel and plugins are set up
+    get_engine()
+    warmup_task = asyncio.create_task(warmup_query())
+    kernel = await asyncio.to_thread(get_kernel)
+    await warmup_task
     
     # Run the appropriate demo
     queries = [args.query] if args.query else None
@@ -158,7 +203,14 @@ async def main():
     if args.mode == 'basic':
         await run_basic_demo(kernel, queries)
     else:
-        await run_advanced_demo(kernel, queries)
+        await run_advanced_demo(kernel, queries, interpret=args.interpret)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # Use uvloop's faster event loop when it is installed (not available on Windows);
+    # uvloop.run replaces uvloop.install, which is deprecated on Python 3.12+
+    try:
+        from uvloop import run
+    except ImportError:
+        run = asyncio.run
+    
+    run(main())
\ No newline at end of file
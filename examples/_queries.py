@@ -0,0 +1,19 @@
+"""
+Canned natural language queries shared by the demo and example scripts.
+"""
+
+from typing import Tuple
+
+# Example natural language queries
+BASIC_QUERIES: Tuple[str, ...] = (
+    "What are the top 5 customers by order total?",
+    "Show me all employees who are in the Sales department",
+    "What is the average product price by category?",
+)
+
+# Example complex analysis requests
+ANALYSIS_REQUESTS: Tuple[str, ...] = (
+    "Analyze sales trends over the last quarter and identify top-performing products",
+    "Investigate customer churn patterns and suggest retention strategies",
+    "Evaluate employee performance across departments and identify areas for improvement",
+)
@@ -8,29 +8,55 @@ This example shows how to:
 """
 
 import os
+import re
+import sys
 import asyncio
+import hashlib
 import logging
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, AsyncIterator, Optional, Tuple
 
 import semantic_kernel as sk
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
-from semantic_kernel.prompt_template.kernel_prompt_template import KernelPromptTemplate
-from semantic_kernel.functions import kernel_function, KernelFunction
+from semantic_kernel.functions import kernel_function, KernelArguments, KernelFunction, KernelFunctionFromPrompt
+from semantic_kernel.prompt_template import PromptTemplateConfig
 
 from dotenv import load_dotenv
-import sys
-import os
 
-# Add the parent directory to sys.path to import the package
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nl2sql_solution.database import create_pooled_engine
+from nl2sql_solution.nl2sql_plugin import register_nl2sql_plugin
+from nl2sql_solution.utils import load_environment_variables, looks_like_error
 
-from src.nl2sql_plugin import register_nl2sql_plugin
-from src.utils import load_environment_variables
+# Imported as examples.advanced_example (demo.py, python -m), or run directly as a script
+try:
+    from examples._queries import ANALYSIS_REQUESTS
+except ImportError:
+    from _queries import ANALYSIS_REQUESTS
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Maximum number of interpretations kept in memory
+INTERPRETATION_CACHE_SIZE = 256
+
+# Phrases the SQL agent uses when a query returned no data
+EMPTY_RESULT_PATTERN = re.compile(
+    r'\b(?:no (?:results|rows|data|records)(?: (?:were )?(?:found|returned))?|returned 0 rows|0 rows)\b',
+    re.IGNORECASE
+)
+
+def _has_data_rows(query_result: str) -> bool:
+    """Check whether a query result contains data worth interpreting."""
+    stripped = query_result.strip()
+    if not stripped or stripped in ("[]", "()"):
+        return False
+    
+    # A one-line answer that only says nothing was found has no data to interpret
+    if "\n" not in stripped and EMPTY_RESULT_PATTERN.search(stripped):
+        return False
+    return True
+
 class DataAnalysisPlugin:
     """
     A simple plugin for analyzing data in natural language.
@@ -40,17 +66,44 @@ class DataAnalysisPlugin:
     def __init__(self, kernel: sk.Kernel):
         """Initialize the DataAnalysisPlugin."""
         self.kernel = kernel
+        
+        # Define a prompt for result interpretation
+        interpret_prompt = """
+        You are a data analyst assistant. Interpret the following database query results 
+        in the context of the original analysis request. Provide insights, trends, and 
+        recommendations based on the data.
+        
+        Original Request: {{$request}}
+        
+        Query Results:
+        {{$results}}
+        
+        Interpretation:
+        """
+        
+        # Interpretations keyed by (request, query result hash), most recently used last
+        self._interpretation_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        
+        # Create the prompt function once and reuse it for every interpretation.
+        # It isn't registered on the kernel: this plugin is added as "DataAnalysis",
+        # which would replace a function registered under that plugin name.
+        self._interpret_fn = KernelFunctionFromPrompt(
+            function_name="InterpretResults",
+            plugin_name="DataAnalysis",
+            prompt_template_config=PromptTemplateConfig(template=interpret_prompt)
+        )
     
     @kernel_function(
         description="Analyze data from a database using natural language",
         name="analyze_data"
     )
-    async def analyze_data(self, analysis_request: str) -> str:
+    async def analyze_data(self, analysis_request: str, interpret: bool = True) -> str:
         """
         Analyze data by translating the request to SQL and interpreting the results.
         
         Args:
             analysis_request: A natural language request for data analysis
+            interpret: If False, return the raw query result without the interpretation LLM call
             
         Returns:
             Analysis results as a string
@@ -60,10 +113,12 @@ class DataAnalysisPlugin:
         
         try:
             # Execute the natural language query
-            query_result = await self.kernel.invoke(nl2sql_function, analysis_request)
+            query_result = str(await self.kernel.invoke(nl2sql_function, query=analysis_request))
+            if not interpret:
+                return query_result
             
             # Step 2: If we have results, interpret them
-            if query_result and "error" not in query_result.lower():
+            if query_result and not looks_like_error(query_result) and _has_data_rows(query_result):
                 interpretation = await self._interpret_results(analysis_request, query_result)
                 return f"Analysis Results:\n\n{interpretation}"
             else:
@@ -72,6 +127,55 @@ class DataAnalysisPlugin:
             logger.error(f"Error in analyze_data: {str(e)}")
             return f"Error analyzing data: {str(e)}"
     
+    async def stream_analysis(self,
+                              analysis_request: str,
+                              query_result: Optional[str] = None,
+                              interpret: bool = True) -> AsyncIterator[str]:
+        """
+        Analyze data like analyze_data, but stream the interpretation as it is generated.
+        
+        Args:
+            analysis_request: A natural language request for data analysis
+            query_result: The NL2SQL query result, if the query was already executed
+            interpret: If False, yield the raw query result without the interpretation LLM call
+            
+        Yields:
+            Chunks of the analysis results
+        """
+        try:
+            # Step 1: Execute the natural language query unless it was prefetched
+            if query_result is None:
+                nl2sql_function = self.kernel.plugins["NL2SQL"]["query_database"]
+                query_result = str(await self.kernel.invoke(nl2sql_function, query=analysis_request))
+            
+            if not interpret:
+                yield query_result
+                return
+            
+            if not query_result or looks_like_error(query_result) or not _has_data_rows(query_result):
+                yield f"Unable to retrieve data for analysis. Details: {query_result}"
+                return
+            
+            yield "Analysis Results:\n\n"
+            
+            # Step 2: Reuse a cached interpretation, or stream a new one token by token
+            cache_key = self._interpretation_cache_key(analysis_request, query_result)
+            cached_interpretation = self._get_cached_interpretation(cache_key)
+            if cached_interpretation is not None:
+                yield cached_interpretation
+                return
+            
+            chunks = []
+            async for chunk in self.kernel.invoke_stream(
+                self._interpret_fn, request=analysis_request, results=query_result
+            ):
+                chunks.append(str(chunk[0]))
+                yield chunks[-1]
+            self._cache_interpretation(cache_key, "".join(chunks))
+        except Exception as e:
+            logger.error(f"Error in stream_analysis: {str(e)}")
+            yield f"Error analyzing data: {str(e)}"
+    
     async def _interpret_results(self, original_request: str, query_results: str) -> str:
         """
         Interpret the query results using a Semantic Kernel prompt.
@@ -83,36 +187,34 @@ class DataAnalysisPlugin:
         Returns:
             An interpretation of the results
         """
-        # Define a prompt for result interpretation
-        interpret_prompt = """
-        You are a data analyst assistant. Interpret the following database query results 
-        in the context of the original analysis request. Provide insights, trends, and 
-        recommendations based on the data.
-        
-        Original Request: {{$request}}
-        
-        Query Results:
-        {{$results}}
-        
-        Interpretation:
-        """
-        
-        # Create a prompt template
-        prompt_template = KernelPromptTemplate(interpret_prompt)
-        prompt_config = sk.PromptTemplateConfig(template=interpret_prompt)
-        prompt_template = kernel.create_function_from_prompt(
-            prompt_config,
-            plugin_name="DataAnalysis",
-            function_name="InterpretResults"
-        )
+        cache_key = self._interpretation_cache_key(original_request, query_results)
+        cached_interpretation = self._get_cached_interpretation(cache_key)
+        if cached_interpretation is not None:
+            return cached_interpretation
         
         # Execute the prompt
-        context_variables = sk.ContextVariables()
-        context_variables["request"] = original_request
-        context_variables["results"] = query_results
-        
-        interpretation = await self.kernel.invoke(prompt_template, context_variables)
-        return str(interpretation)
+        args = KernelArguments(request=original_request, results=query_results)
+        interpretation = str(await self.kernel.invoke(self._interpret_fn, args))
+        self._cache_interpretation(cache_key, interpretation)
+        return interpretation
+    
+    @staticmethod
+    def _interpretation_cache_key(original_request: str, query_results: str) -> Tuple[str, str]:
+        """Build the interpretation cache key from the request and a hash of the results."""
+        return original_request, hashlib.sha256(query_results.encode("utf-8")).hexdigest()
+    
+    def _get_cached_interpretation(self, cache_key: Tuple[str, str]) -> Optional[str]:
+        """Get a cached interpretation, marking it as recently used."""
+        interpretation = self._interpretation_cache.get(cache_key)
+        if interpretation is not None:
+            self._interpretation_cache.move_to_end(cache_key)
+        return interpretation
+    
+    def _cache_interpretation(self, cache_key: Tuple[str, str], interpretation: str) -> None:
+        """Cache an interpretation, evicting the least recently used entry if full."""
+        self._interpretation_cache[cache_key] = interpretation
+        if len(self._interpretation_cache) > INTERPRETATION_CACHE_SIZE:
+            self._interpretation_cache.popitem(last=False)
 
 async def main():
     """Run the advanced example."""
@@ -135,6 +237,9 @@ async def main():
         )
     )
     
+    # Create one pooled engine shared by all queries in this process
+    engine = create_pooled_engine(env_vars["connection_string"])
+    
     # Register the NL2SQL plugin
     register_nl2sql_plugin(
         kernel=kernel,
@@ -143,8 +248,11 @@ async def main():
         azure_openai_endpoint=env_vars["azure_openai_endpoint"],
         azure_openai_api_version=env_vars["azure_openai_api_version"],
         azure_openai_deployment_name=env_vars["azure_openai_deployment_name"],
+        azure_openai_fast_deployment_name=env_vars["azure_openai_fast_deployment_name"],
         included_tables=env_vars["included_tables"],
-        read_only=env_vars["read_only"]  # Use read-only setting from environment
+        read_only=env_vars["read_only"],  # Use read-only setting from environment
+        engine=engine,
+        cache_schema=True
     )
     
     # Register the data analysis plugin
@@ -152,30 +260,35 @@ async def main():
     kernel.add_plugin(data_analysis_plugin, "DataAnalysis")
     
     # Example complex analysis requests
-    analysis_requests = [
-        "Analyze sales trends over the last quarter and identify top-performing products",
-        "Investigate customer churn patterns and suggest retention strategies",
-        "Evaluate employee performance across departments and identify areas for improvement"
-    ]
-    
-    # Process each analysis request
-    for request in analysis_requests:
-        print(f"\n\nProcessing analysis request: '{request}'")
-        print("-" * 80)
+    analysis_requests = ANALYSIS_REQUESTS
+    
+    # Run the NL2SQL queries concurrently
+    query_database_function = kernel.plugins["NL2SQL"]["query_database"]
+    query_results = await asyncio.gather(
+        *[kernel.invoke(query_database_function, query=request) for request in analysis_requests],
+        return_exceptions=True
+    )
+    
+    # Stream each interpretation to stdout as it is generated
+    for request, query_result in zip(analysis_requests, query_results):
+        header = f"\n\nProcessing analysis request: '{request}'\n{'-' * 80}\n"
         
-        try:
-            # Get the data analysis function
-            analyze_data_function = kernel.plugins["DataAnalysis"]["analyze_data"]
-            
-            # Execute the analysis
-            result = await kernel.invoke(analyze_data_function, request)
-            
-            # Print the result
-            print(f"Result:\n{result}")
-            
-        except Exception as e:
-            logger.error(f"Error processing analysis request: {str(e)}")
-            print(f"Error: {str(e)}")
+        if isinstance(query_result, Exception):
+            logger.error(f"Error processing analysis request: {str(query_result)}")
+            sys.stdout.write(f"{header}Error: {str(query_result)}\n")
+            continue
+        
+        sys.stdout.write(f"{header}Result:\n")
+        async for chunk in data_analysis_plugin.stream_analysis(request, str(query_result)):
+            print(chunk, end="", flush=True)
+        print()
 
 if __name__ == "__main__":
+    # Use uvloop's faster event loop when it is installed (not available on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
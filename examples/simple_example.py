@@ -8,6 +8,7 @@ This example shows how to:
 """
 
 import os
+import sys
 import asyncio
 import logging
 
@@ -15,14 +16,17 @@ import semantic_kernel as sk
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 
 from dotenv import load_dotenv
-import sys
-import os
 
-# Add the parent directory to sys.path to import the package
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nl2sql_solution.database import create_pooled_engine
+from nl2sql_solution.nl2sql_plugin import register_nl2sql_plugin
+from nl2sql_solution.semantic_cache import SemanticCachedFunction, make_cache_key
+from nl2sql_solution.utils import load_environment_variables
 
-from src.nl2sql_plugin import register_nl2sql_plugin
-from src.utils import load_environment_variables
+# Run as a module from the repo root (python -m examples.<name>), or directly as a script
+try:
+    from examples._queries import BASIC_QUERIES
+except ImportError:
+    from _queries import BASIC_QUERIES
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -49,6 +53,9 @@ async def main():
         )
     )
     
+    # Create one pooled engine shared by all queries in this process
+    engine = create_pooled_engine(env_vars["connection_string"])
+    
     # Register the NL2SQL plugin
     register_nl2sql_plugin(
         kernel=kernel,
@@ -57,46 +64,49 @@ async def main():
         azure_openai_endpoint=env_vars["azure_openai_endpoint"],
         azure_openai_api_version=env_vars["azure_openai_api_version"],
         azure_openai_deployment_name=env_vars["azure_openai_deployment_name"],
+        azure_openai_fast_deployment_name=env_vars["azure_openai_fast_deployment_name"],
         included_tables=env_vars["included_tables"],
-        read_only=env_vars["read_only"]  # Use read-only setting from environment
+        read_only=env_vars["read_only"],  # Use read-only setting from environment
+        engine=engine,
+        cache_schema=True
     )
     
     # Example natural language queries
-    queries = [
-        "What are the top 5 customers by order total?",
-        "Show me all employees who are in the Sales department",
-        "What is the average product price by category?"
-    ]
+    queries = BASIC_QUERIES
+    
+    # Start fetching schema information in the background so it overlaps with the queries
+    schema_task = asyncio.create_task(kernel.invoke(kernel.plugins["NL2SQL"]["get_schema_info"]))
     
-    # Execute each query
-    for query in queries:
-        print(f"\n\nExecuting query: '{query}'")
-        print("-" * 50)
+    # Wrap the NL2SQL plugin's query_database function in a semantic cache
+    cached = SemanticCachedFunction(
+        kernel,
+        kernel.plugins["NL2SQL"]["query_database"],
+        cache_key=make_cache_key(env_vars["connection_string"], env_vars["included_tables"])
+    )
+    
+    # Execute the queries concurrently; they are independent LLM round-trips
+    # (similar, previously seen queries are served from the cache)
+    results = await asyncio.gather(*[cached.invoke(query) for query in queries], return_exceptions=True)
+    
+    # Print each result
+    for query, result in zip(queries, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error executing query: {str(result)}")
+            body = f"Error: {str(result)}"
+        else:
+            body = f"Result:\n{result}"
         
-        try:
-            # Get the NL2SQL plugin's query_database function
-            query_database_function = kernel.plugins["NL2SQL"]["query_database"]
-            
-            # Execute the query
-            result = await kernel.invoke(query_database_function, **{"query": query})
-            
-            # Print the result
-            print(f"Result:\n{result}")
-            
-        except Exception as e:
-            logger.error(f"Error executing query: {str(e)}")
-            print(f"Error: {str(e)}")
+        # Emit each query's block with a single write
+        sys.stdout.write(f"\n\nExecuting query: '{query}'\n{'-' * 50}\n{body}\n")
+    sys.stdout.flush()
     
     # Get schema information
     print("\n\nGetting schema information:")
     print("-" * 50)
     
     try:
-        # Get the NL2SQL plugin's get_schema_info function
-        get_schema_info_function = kernel.plugins["NL2SQL"]["get_schema_info"]
-        
-        # Get the schema information
-        schema_info = await kernel.invoke(get_schema_info_function)
+        # Get the schema information fetched in the background
+        schema_info = await schema_task
         
         # Print the schema information
         print(f"Schema Information:\n{schema_info}")
@@ -106,4 +116,11 @@ async def main():
         print(f"Error: {str(e)}")
 
 if __name__ == "__main__":
+    # Use uvloop's faster event loop when it is installed (not available on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
@@ -3,6 +3,7 @@ Test script for NL2SQL solution showing original questions and database results.
 """
 
 import os
+import sys
 import asyncio
 import logging
 
@@ -10,14 +11,17 @@ import semantic_kernel as sk
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 
 from dotenv import load_dotenv
-import sys
-import os
 
-# Add the parent directory to sys.path to import the package
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from nl2sql_solution.database import create_pooled_engine
+from nl2sql_solution.nl2sql_plugin import register_nl2sql_plugin
+from nl2sql_solution.semantic_cache import SemanticCachedFunction, make_cache_key
+from nl2sql_solution.utils import load_environment_variables
 
-from src.nl2sql_plugin import register_nl2sql_plugin
-from src.utils import load_environment_variables
+# Run as a module from the repo root (python -m examples.<name>), or directly as a script
+try:
+    from examples._queries import BASIC_QUERIES
+except ImportError:
+    from _queries import BASIC_QUERIES
 
 # Set up minimal logging
 logging.basicConfig(level=logging.WARNING)
@@ -43,6 +47,9 @@ async def main():
         )
     )
     
+    # Create one pooled engine shared by all queries in this process
+    engine = create_pooled_engine(env_vars["connection_string"])
+    
     # Register the NL2SQL plugin
     register_nl2sql_plugin(
         kernel=kernel,
@@ -51,44 +58,52 @@ async def main():
         azure_openai_endpoint=env_vars["azure_openai_endpoint"],
         azure_openai_api_version=env_vars["azure_openai_api_version"],
         azure_openai_deployment_name=env_vars["azure_openai_deployment_name"],
+        azure_openai_fast_deployment_name=env_vars["azure_openai_fast_deployment_name"],
         included_tables=env_vars["included_tables"],
-        read_only=env_vars["read_only"]
+        read_only=env_vars["read_only"],
+        engine=engine,
+        cache_schema=True
     )
     
     # Test queries
-    test_queries = [
-        "What are the top 5 customers by order total?",
-        "Show me all employees who are in the Sales department",
-        "What is the average product price by category?"
-    ]
+    test_queries = BASIC_QUERIES
     
     # Execute and display results
-    query_database_function = kernel.plugins["NL2SQL"]["query_database"]
+    cached = SemanticCachedFunction(
+        kernel,
+        kernel.plugins["NL2SQL"]["query_database"],
+        cache_key=make_cache_key(env_vars["connection_string"], env_vars["included_tables"])
+    )
+    
+    # Execute the queries concurrently; they are independent LLM round-trips
+    results = await asyncio.gather(*[cached.invoke(query) for query in test_queries], return_exceptions=True)
     
-    print("\n" + "="*80)
-    print("NL2SQL Solution Test Results")
-    print("="*80)
+    # Collect the report and write it out in one go
+    lines = ["", "="*80, "NL2SQL Solution Test Results", "="*80]
     
-    for i, query in enumerate(test_queries, 1):
-        print(f"\nQuery {i}: {query}")
-        print("-" * 60)
+    for i, (query, result) in enumerate(zip(test_queries, results), 1):
+        lines.append(f"\nQuery {i}: {query}")
+        lines.append("-" * 60)
         
-        try:
-            # Execute the query
-            result = await kernel.invoke(query_database_function, **{"query": query})
-            
+        if isinstance(result, Exception):
+            lines.append(f"Error: {str(result)}")
+        else:
             # Display the result
-            print("Result from Database Agent:")
-            print(result)
-            
-        except Exception as e:
-            print(f"Error: {str(e)}")
+            lines.append("Result from Database Agent:")
+            lines.append(str(result))
         
-        print("-" * 60)
+        lines.append("-" * 60)
     
-    print("\n" + "="*80)
-    print("Test Complete")
-    print("="*80)
+    lines.extend(["", "="*80, "Test Complete", "="*80, ""])
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.flush()
 
 if __name__ == "__main__":
+    # Use uvloop's faster event loop when it is installed (not available on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
@@ -2,7 +2,7 @@
 Setup script for the NL2SQL solution package.
 """
 
-from setuptools import setup, find_packages
+from setuptools import setup
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -16,7 +16,8 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/yourusername/NL2SQL-Solution-1",
-    packages=find_packages(),
+    packages=["nl2sql_solution"],
+    package_dir={"nl2sql_solution": "src"},
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -27,10 +28,25 @@ setup(
         "semantic-kernel>=0.9.0b1",
         "langchain>=0.1.0",
         "langchain-openai>=0.0.3",
-        "langchain-community>=0.0.6",
+        "langchain-community>=0.2.0",
         "langchain-experimental>=0.0.26",
         "python-dotenv>=1.0.0",
         "sqlalchemy>=2.0.0",
         "pyodbc>=4.0.39",
+        "uvloop>=0.19; platform_system != 'Windows'",
     ],
+    extras_require={
+        "cache": [
+            "sentence-transformers>=2.2.0",
+            "faiss-cpu>=1.7.4",
+        ],
+        "hyperscan": [
+            "hyperscan>=0.4.0",
+            "pyahocorasick>=2.0.0",
+        ],
+        "async": [
+            "aioodbc>=0.5.0",
+            "sqlalchemy[asyncio]>=2.0.0",
+        ],
+    },
 )
\ No newline at end of file
@@ -6,26 +6,34 @@ SQL capabilities to translate natural language queries into T-SQL for Azure SQL
 """
 
 import os
+import re
 import logging
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Tuple
 
-import semantic_kernel as sk
 from semantic_kernel.functions import kernel_function
 from dotenv import load_dotenv
 from langchain_openai import AzureChatOpenAI
-from langchain_community.utilities.sql_database import SQLDatabase
 from langchain_community.agent_toolkits.sql.toolkit import SQLDatabaseToolkit
 from langchain_community.agent_toolkits.sql.base import create_sql_agent
 from langchain.agents.agent_types import AgentType
 from langchain.callbacks.base import BaseCallbackHandler
+from sqlalchemy.engine import Engine
 
 from .database import DatabaseManager
 from .security import SecurityValidator
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Queries at most this long that mention at most one table are routed to the fast model
+SIMPLE_QUERY_MAX_LENGTH = 80
+
+# Words that usually indicate multi-step analysis rather than a simple lookup
+COMPLEX_QUERY_PATTERN = re.compile(
+    r'\b(?:trends?|compar\w*|correlat\w*|analy[sz]\w*|over time|growth|churn|forecast\w*|why|versus|vs)\b',
+    re.IGNORECASE
+)
+
 class SQLQueryCallbackHandler(BaseCallbackHandler):
     """Callback handler for logging SQL queries generated by LangChain."""
     
@@ -34,16 +42,16 @@ class SQLQueryCallbackHandler(BaseCallbackHandler):
     
     def on_llm_start(self, serialized, prompts, **kwargs):
         """Log when LLM starts."""
-        logger.debug(f"LLM started with prompts: {prompts}")
+        logger.debug("LLM started with prompts: %s", prompts)
     
     def on_tool_start(self, serialized, input_str, **kwargs):
         """Log when a tool starts, capturing SQL queries."""
         tool_name = kwargs.get("name", "unknown_tool")
         if tool_name in ["sql_db_query", "sql_db_schema", "sql_db_list_tables"]:
-            logger.info(f"SQL Tool '{tool_name}' started with input: {input_str}")
+            logger.info("SQL Tool '%s' started with input: %s", tool_name, input_str)
             if "SELECT" in input_str.upper() or "INSERT" in input_str.upper() or "UPDATE" in input_str.upper() or "DELETE" in input_str.upper():
                 self.sql_queries.append(input_str)
-                logger.info(f"Captured SQL query: {input_str}")
+                logger.info("Captured SQL query: %s", input_str)
 
 class LangChainSqlPlugin:
     """
@@ -58,9 +66,12 @@ class LangChainSqlPlugin:
                  azure_openai_endpoint: Optional[str] = None,
                  azure_openai_api_version: Optional[str] = None,
                  azure_openai_deployment_name: Optional[str] = None,
+                 azure_openai_fast_deployment_name: Optional[str] = None,
                  included_tables: Optional[List[str]] = None,
                  read_only: bool = True,
-                 include_image_columns: bool = False):
+                 include_image_columns: bool = False,
+                 engine: Optional[Engine] = None,
+                 cache_schema: bool = False):
         """
         Initialize the LangChain SQL Plugin.
         
@@ -70,8 +81,13 @@ class LangChainSqlPlugin:
             azure_openai_endpoint: Azure OpenAI endpoint. If None, reads from env vars.
             azure_openai_api_version: Azure OpenAI API version. If None, reads from env vars.
             azure_openai_deployment_name: Azure OpenAI deployment name. If None, reads from env vars.
+            azure_openai_fast_deployment_name: Optional smaller/faster deployment used for simple
+                queries. If None, reads from env vars; if unset, all queries use the main deployment.
             included_tables: List of tables to include. If None, reads from env vars or includes all.
             read_only: Whether the database connection should be read-only.
+            include_image_columns: Whether to include IMAGE and NTEXT columns in schema.
+            engine: Existing SQLAlchemy engine to reuse instead of creating a new one.
+            cache_schema: Whether to persist rendered schema info to disk and reuse it on later runs.
         """
         # Load environment variables
         load_dotenv()
@@ -81,9 +97,12 @@ class LangChainSqlPlugin:
         self.azure_openai_endpoint = azure_openai_endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
         self.azure_openai_api_version = azure_openai_api_version or os.getenv("AZURE_OPENAI_API_VERSION")
         self.azure_openai_deployment_name = azure_openai_deployment_name or os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
+        self.azure_openai_fast_deployment_name = azure_openai_fast_deployment_name or os.getenv("AZURE_OPENAI_FAST_DEPLOYMENT_NAME")
         
         # Set up Azure SQL configuration
         self.connection_string = connection_string or os.getenv("AZURE_SQL_CONNECTION_STRING")
+        self.engine = engine
+        self.cache_schema = cache_schema
         
         # Parse included tables from env if not provided
         if included_tables is None:
@@ -115,7 +134,7 @@ class LangChainSqlPlugin:
             missing.append("AZURE_OPENAI_API_VERSION")
         if not self.azure_openai_deployment_name:
             missing.append("AZURE_OPENAI_DEPLOYMENT_NAME")
-        if not self.connection_string:
+        if not self.connection_string and self.engine is None:
             missing.append("AZURE_SQL_CONNECTION_STRING")
             
         if missing:
@@ -124,20 +143,16 @@ class LangChainSqlPlugin:
     def _setup_database_and_langchain(self):
         """Set up the database manager and LangChain components."""
         # Initialize Azure OpenAI
-        self.llm = AzureChatOpenAI(
-            azure_deployment=self.azure_openai_deployment_name,
-            openai_api_version=self.azure_openai_api_version,
-            azure_endpoint=self.azure_openai_endpoint,
-            api_key=self.azure_openai_api_key,
-            temperature=0
-        )
+        self.llm = self._create_llm(self.azure_openai_deployment_name)
         
         # Initialize database manager
         self.db_manager = DatabaseManager(
             connection_string=self.connection_string,
             included_tables=self.included_tables,
             sample_rows_in_table_info=3,
-            include_image_columns=self.include_image_columns
+            include_image_columns=self.include_image_columns,
+            engine=self.engine,
+            cache_schema=self.cache_schema
         )
         
         # Get the LangChain SQLDatabase instance from the manager
@@ -149,19 +164,65 @@ class LangChainSqlPlugin:
             llm=self.llm
         )
         
-        # Set up the callback handler for logging
-        self.callback_handler = SQLQueryCallbackHandler()
-        
         # Create the SQL agent
+        # SQL query callback handlers are attached per invocation so concurrent
+        # queries don't share captured SQL
         self.agent = create_sql_agent(
             llm=self.llm,
             toolkit=self.sql_toolkit,
             agent_type=AgentType.OPENAI_FUNCTIONS,
-            verbose=True,
-            agent_executor_kwargs={"callbacks": [self.callback_handler]}
+            verbose=True
         )
         
+        # Create a second agent on the fast deployment for simple queries
+        self.fast_agent = None
+        if self.azure_openai_fast_deployment_name:
+            fast_llm = self._create_llm(self.azure_openai_fast_deployment_name)
+            self.fast_agent = create_sql_agent(
+                llm=fast_llm,
+                toolkit=SQLDatabaseToolkit(db=self.db, llm=fast_llm),
+                agent_type=AgentType.OPENAI_FUNCTIONS,
+                verbose=True
+            )
+            logger.info(f"Simple queries will be routed to deployment '{self.azure_openai_fast_deployment_name}'")
+        
         logger.info("LangChain SQL Agent initialized successfully")
+    
+    def _create_llm(self, deployment_name: str) -> AzureChatOpenAI:
+        """Create an Azure OpenAI chat model for the given deployment."""
+        return AzureChatOpenAI(
+            azure_deployment=deployment_name,
+            openai_api_version=self.azure_openai_api_version,
+            azure_endpoint=self.azure_openai_endpoint,
+            api_key=self.azure_openai_api_key,
+            temperature=0
+        )
+    
+    def _is_simple_query(self, natural_language_query: str) -> bool:
+        """
+        Heuristically decide whether a query is simple enough for the fast model.
+        
+        A query is simple if it is short, has no analytical keywords, and
+        mentions at most one table.
+        """
+        if len(natural_language_query) > SIMPLE_QUERY_MAX_LENGTH:
+            return False
+        if COMPLEX_QUERY_PATTERN.search(natural_language_query):
+            return False
+        
+        query_lower = natural_language_query.lower()
+        mentioned_tables = [
+            table for table in self.db.get_usable_table_names()
+            if table.lower().rstrip("s") in query_lower
+        ]
+        return len(mentioned_tables) <= 1
+    
+    def _select_agent(self, natural_language_query: str):
+        """Route a query to the fast agent if it is simple, otherwise to the main agent."""
+        if self.fast_agent is not None and self._is_simple_query(natural_language_query):
+            logger.info("Routing query to fast deployment")
+            return self.fast_agent
+        return self.agent
 
     @kernel_function(
         description="Translates a natural language query into SQL and executes it against an Azure SQL database",
@@ -181,61 +242,119 @@ class LangChainSqlPlugin:
             return "Error: Empty query provided."
         
         try:
-            logger.info(f"Processing natural language query: {natural_language_query}")
+            sanitized_query, error_message = self._prepare_query(natural_language_query)
+            if error_message:
+                return error_message
             
-            # Validate the natural language input
-            is_valid, error_message = self.security_validator.validate_nl_input(natural_language_query)
-            if not is_valid:
-                logger.warning(f"Security validation failed for query: {error_message}")
-                return f"Error: Security validation failed. {error_message}"
+            # Use a fresh callback handler to capture this query's SQL
+            callback_handler = SQLQueryCallbackHandler()
             
-            # Sanitize the input (this is a basic defense layer)
-            sanitized_query = self.security_validator.sanitize_nl_input(natural_language_query)
-            if sanitized_query != natural_language_query:
-                logger.info("Natural language query was sanitized before processing")
+            # Execute the query using the LangChain SQL agent
+            agent = self._select_agent(sanitized_query)
+            result = agent.invoke({"input": sanitized_query}, config={"callbacks": [callback_handler]})
             
-            # Reset the callback handler's query list
-            self.callback_handler.sql_queries = []
+            self._audit_sql_queries(natural_language_query, callback_handler.sql_queries)
+            
+            # Format and return the result
+            return result["output"]
+        
+        except Exception as e:
+            return self._handle_query_error(natural_language_query, e)
+    
+    async def aquery_database_with_natural_language(self, natural_language_query: str) -> str:
+        """
+        Async version of query_database_with_natural_language.
+        
+        LLM calls are awaited instead of blocking a worker thread; the agent's
+        database tools still run synchronously in LangChain's executor.
+        
+        Args:
+            natural_language_query: The natural language query to translate to SQL.
+            
+        Returns:
+            The result of the SQL query, formatted as a string.
+        """
+        if not natural_language_query:
+            return "Error: Empty query provided."
+        
+        try:
+            sanitized_query, error_message = self._prepare_query(natural_language_query)
+            if error_message:
+                return error_message
+            
+            # Use a fresh callback handler to capture this query's SQL
+            callback_handler = SQLQueryCallbackHandler()
             
             # Execute the query using the LangChain SQL agent
-            result = self.agent.invoke({"input": sanitized_query})
+            agent = self._select_agent(sanitized_query)
+            result = await agent.ainvoke({"input": sanitized_query}, config={"callbacks": [callback_handler]})
             
-            # Get the SQL queries captured during execution
-            sql_queries = self.callback_handler.sql_queries
-            if sql_queries:
-                logger.info(f"SQL Queries Generated: {sql_queries}")
-                
-                # Validate each SQL query for security concerns (optional validation)
-                # Note: LangChain already executes the query and the primary security
-                # defense is the least-privilege database user
-                for sql_query in sql_queries:
-                    is_valid, error_message = self.security_validator.validate_sql_query(sql_query)
-                    if not is_valid:
-                        logger.warning(f"Generated SQL query failed security validation: {error_message}")
-                        # We log but don't block here since LangChain already executed it
-                
-                # Create audit record
-                audit_record = self.security_validator.audit_query(
-                    nl_query=natural_language_query,
-                    sql_query="\n".join(sql_queries),
-                    result_status="success"
-                )
-                logger.info(f"Audit record: {audit_record}")
+            self._audit_sql_queries(natural_language_query, callback_handler.sql_queries)
             
             # Format and return the result
             return result["output"]
         
         except Exception as e:
-            error_message = f"Error processing query: {str(e)}"
-            logger.error(error_message)
+            return self._handle_query_error(natural_language_query, e)
+    
+    def _prepare_query(self, natural_language_query: str) -> Tuple[str, Optional[str]]:
+        """
+        Validate and sanitize a natural language query before it is sent to the agent.
+        
+        Returns:
+            Tuple of (sanitized query, error message). The error message is None if the query is valid.
+        """
+        logger.info("Processing natural language query: %s", natural_language_query)
+        
+        # Validate the natural language input
+        is_valid, error_message = self.security_validator.validate_nl_input(natural_language_query)
+        if not is_valid:
+            logger.warning("Security validation failed for query: %s", error_message)
+            return natural_language_query, f"Error: Security validation failed. {error_message}"
+        
+        # Sanitize the input (this is a basic defense layer)
+        sanitized_query = self.security_validator.sanitize_nl_input(natural_language_query)
+        if sanitized_query != natural_language_query:
+            logger.info("Natural language query was sanitized before processing")
+        
+        return sanitized_query, None
+    
+    def _audit_sql_queries(self, natural_language_query: str, sql_queries: List[str]) -> None:
+        """Validate and audit the SQL queries the agent generated for a natural language query."""
+        if not sql_queries:
+            return
+        
+        logger.info("SQL Queries Generated: %s", sql_queries)
+        
+        # Validate each SQL query for security concerns (optional validation)
+        # Note: LangChain already executes the query and the primary security
+        # defense is the least-privilege database user
+        for sql_query in sql_queries:
+            is_valid, error_message = self.security_validator.validate_sql_query(sql_query)
+            if not is_valid:
+                logger.warning("Generated SQL query failed security validation: %s", error_message)
+                # We log but don't block here since LangChain already executed it
+        
+        # Create audit record
+        audit_record = self.security_validator.audit_query(
+            nl_query=natural_language_query,
+            sql_query="\n".join(sql_queries),
+            result_status="success"
+        )
+        logger.info("Audit record: %s", audit_record)
+    
+    def _handle_query_error(self, natural_language_query: str, e: Exception) -> str:
+        """Log and audit a failed query, returning the error message for the caller."""
+        error_message = f"Error processing query: {str(e)}"
+        logger.error(error_message)
+        
+        # Create audit record for the error
+        if hasattr(self, 'security_validator'):
+            audit_record = self.security_validator.audit_query(
+                nl_query=natural_language_query,
+                sql_query="<error>",
+                result_status=f"error: {str(e)}"
+            )
+            logger.info("Audit record: %s", audit_record)
             
-            # Create audit record for the error
-            if hasattr(self, 'security_validator'):
-                audit_record = self.security_validator.audit_query(
-                    nl_query=natural_language_query,
-                    sql_query="<error>",
-                    result_status=f"error: {str(e)}"
-                )
-                logger.info(f"Audit record: {audit_record}")
-                
-            return error_message
\ No newline at end of file
+        return error_message
\ No newline at end of file
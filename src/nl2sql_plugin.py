@@ -4,18 +4,19 @@ Semantic Kernel NL2SQL Plugin using LangChain.
 This module provides the main plugin integration for Semantic Kernel.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 
-import semantic_kernel as sk
-from semantic_kernel.functions import kernel_function, KernelFunction
-from semantic_kernel.kernel import Kernel
+from semantic_kernel.functions import kernel_function
 
-from .langchain_sql_plugin import LangChainSqlPlugin
 from .utils import sanitize_input
 
+if TYPE_CHECKING:
+    from semantic_kernel.kernel import Kernel
+    from sqlalchemy.engine import Engine
+
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class NL2SQLPlugin:
@@ -32,9 +33,12 @@ class NL2SQLPlugin:
                  azure_openai_endpoint: Optional[str] = None,
                  azure_openai_api_version: Optional[str] = None,
                  azure_openai_deployment_name: Optional[str] = None,
+                 azure_openai_fast_deployment_name: Optional[str] = None,
                  included_tables: Optional[List[str]] = None,
                  read_only: bool = True,
-                 include_image_columns: bool = False):
+                 include_image_columns: bool = False,
+                 engine: Optional["Engine"] = None,
+                 cache_schema: bool = False):
         """
         Initialize the NL2SQL plugin for Semantic Kernel.
         
@@ -44,19 +48,28 @@ class NL2SQLPlugin:
             azure_openai_endpoint: Azure OpenAI endpoint. If None, reads from env vars.
             azure_openai_api_version: Azure OpenAI API version. If None, reads from env vars.
             azure_openai_deployment_name: Azure OpenAI deployment name. If None, reads from env vars.
+            azure_openai_fast_deployment_name: Optional faster deployment for simple queries. If None, reads from env vars.
             included_tables: List of tables to include. If None, reads from env vars or includes all.
             read_only: Whether the database connection should be read-only.
             include_image_columns: Whether to include IMAGE and NTEXT columns in schema (default: False).
+            engine: Existing SQLAlchemy engine to reuse. If None, one is created from the connection string.
+            cache_schema: Whether to persist rendered schema info to disk and reuse it on later runs.
         """
+        # Imported here so importing this module doesn't load LangChain and SQLAlchemy
+        from .langchain_sql_plugin import LangChainSqlPlugin
+        
         self.langchain_plugin = LangChainSqlPlugin(
             connection_string=connection_string,
             azure_openai_api_key=azure_openai_api_key,
             azure_openai_endpoint=azure_openai_endpoint,
             azure_openai_api_version=azure_openai_api_version,
             azure_openai_deployment_name=azure_openai_deployment_name,
+            azure_openai_fast_deployment_name=azure_openai_fast_deployment_name,
             included_tables=included_tables,
             read_only=read_only,
-            include_image_columns=include_image_columns
+            include_image_columns=include_image_columns,
+            engine=engine,
+            cache_schema=cache_schema
         )
         logger.info("NL2SQL Plugin initialized")
     
@@ -64,10 +77,13 @@ class NL2SQLPlugin:
         description="Translates a natural language query into SQL and executes it against an Azure SQL database",
         name="query_database"
     )
-    def query_database(self, query: str) -> str:
+    async def query_database(self, query: str) -> str:
         """
         Execute a natural language query against the database.
         
+        The LangChain agent is invoked asynchronously, so independent queries
+        proceed concurrently (e.g. via asyncio.gather) without pinning a thread each.
+        
         Args:
             query: The natural language query to execute.
             
@@ -75,7 +91,7 @@ class NL2SQLPlugin:
             The result of the SQL query, formatted as a string.
         """
         try:
-            logger.info(f"Executing natural language query: {query}")
+            logger.info("Executing natural language query: %s", query)
             
             # Basic input sanitization
             sanitized_query = sanitize_input(query)
@@ -83,7 +99,7 @@ class NL2SQLPlugin:
                 logger.warning("Query was sanitized before processing")
             
             # Execute the query using the LangChain SQL plugin
-            result = self.langchain_plugin.query_database_with_natural_language(sanitized_query)
+            result = await self.langchain_plugin.aquery_database_with_natural_language(sanitized_query)
             
             return result
         except Exception as e:
@@ -95,46 +111,46 @@ class NL2SQLPlugin:
         description="Gets information about the database schema that the SQL agent can query",
         name="get_schema_info"
     )
-    def get_schema_info(self) -> str:
+    async def get_schema_info(self) -> str:
         """
         Get information about the database schema that the SQL agent can query.
         
+        Schema introspection is blocking database I/O, so it runs in a worker thread
+        and can overlap with concurrently running queries.
+        
         Returns:
             A string describing the database schema (tables and columns).
         """
         try:
-            # Access the LangChain SQL database object's table info
-            db = self.langchain_plugin.db
-            
-            # Format the schema information as a string
-            schema_info = []
-            schema_info.append("Database Schema Information:")
-            
-            # get_usable_table_names() returns a list, not a dict
-            table_names = db.get_usable_table_names()
-            
-            for table_name in table_names:
-                schema_info.append(f"\nTable: {table_name}")
-                
-                # Get column information
-                column_info = db.get_table_info([table_name])
-                schema_info.append(column_info)
-            
-            return "\n".join(schema_info)
+            return await asyncio.to_thread(self._build_schema_info)
         except Exception as e:
             error_message = f"Error retrieving schema information: {str(e)}"
             logger.error(error_message)
             return error_message
+    
+    def _build_schema_info(self) -> str:
+        """Build the schema information string from the LangChain SQL database."""
+        # Access the LangChain SQL database object's table info
+        db = self.langchain_plugin.db
+        
+        # Usable table names are computed once and returned as a tuple
+        table_names = db.get_usable_table_names()
+        
+        # One call renders every table; each section starts with its CREATE TABLE statement
+        return "Database Schema Information:\n\n" + db.get_table_info(table_names)
 
-def register_nl2sql_plugin(kernel: Kernel, 
+def register_nl2sql_plugin(kernel: "Kernel", 
                           connection_string: Optional[str] = None,
                           azure_openai_api_key: Optional[str] = None,
                           azure_openai_endpoint: Optional[str] = None,
                           azure_openai_api_version: Optional[str] = None,
                           azure_openai_deployment_name: Optional[str] = None,
+                          azure_openai_fast_deployment_name: Optional[str] = None,
                           included_tables: Optional[List[str]] = None,
                           read_only: bool = True,
-                          include_image_columns: bool = False) -> None:
+                          include_image_columns: bool = False,
+                          engine: Optional["Engine"] = None,
+                          cache_schema: bool = False) -> None:
     """
     Register the NL2SQL plugin with a Semantic Kernel instance.
     
@@ -145,8 +161,13 @@ def register_nl2sql_plugin(kernel: Kernel,
         azure_openai_endpoint: Azure OpenAI endpoint. If None, reads from env vars.
         azure_openai_api_version: Azure OpenAI API version. If None, reads from env vars.
         azure_openai_deployment_name: Azure OpenAI deployment name. If None, reads from env vars.
+        azure_openai_fast_deployment_name: Optional faster deployment for simple queries. If None, reads from env vars.
         included_tables: List of tables to include. If None, reads from env vars or includes all.
         read_only: Whether the database connection should be read-only.
+        include_image_columns: Whether to include IMAGE and NTEXT columns in schema.
+        engine: Existing SQLAlchemy engine to reuse, e.g. one pool shared across plugins
+            (see nl2sql_solution.database.create_pooled_engine). If None, one is created from the connection string.
+        cache_schema: Whether to persist rendered schema info to disk and reuse it on later runs.
     """
     plugin = NL2SQLPlugin(
         connection_string=connection_string,
@@ -154,9 +175,12 @@ def register_nl2sql_plugin(kernel: Kernel,
         azure_openai_endpoint=azure_openai_endpoint,
         azure_openai_api_version=azure_openai_api_version,
         azure_openai_deployment_name=azure_openai_deployment_name,
+        azure_openai_fast_deployment_name=azure_openai_fast_deployment_name,
         included_tables=included_tables,
         read_only=read_only,
-        include_image_columns=include_image_columns
+        include_image_columns=include_image_columns,
+        engine=engine,
+        cache_schema=cache_schema
     )
     
     kernel.add_plugin(plugin, "NL2SQL")
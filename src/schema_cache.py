@@ -0,0 +1,99 @@
+"""
+On-disk cache of rendered schema information for the NL2SQL solution.
+
+The database schema is static between runs, so the rendered per-table DDL and
+sample rows can be reused instead of introspecting the database on every startup.
+Call DatabaseManager.invalidate_schema_cache() (or delete the cache directory,
+default ~/.cache/nl2sql) after schema changes.
+"""
+
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, List, Optional
+
+from .utils import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+def _cache_path(cache_key: str, cache_dir: Optional[str] = None) -> str:
+    """Get the cache file path for a cache key."""
+    digest = hashlib.sha256(cache_key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir or DEFAULT_CACHE_DIR, f"schema-{digest}.json")
+
+def make_cache_key(connection_string: str,
+                   included_tables: Optional[List[str]],
+                   sample_rows_in_table_info: int,
+                   include_image_columns: bool) -> str:
+    """
+    Build the cache key for a schema rendering.
+
+    Args:
+        connection_string: The database connection string.
+        included_tables: List of included tables, or None for all tables.
+        sample_rows_in_table_info: Number of sample rows rendered per table.
+        include_image_columns: Whether IMAGE and NTEXT columns are rendered.
+
+    Returns:
+        Cache key string.
+    """
+    tables = ",".join(sorted(included_tables)) if included_tables else "*"
+    return f"{connection_string}|{tables}|{sample_rows_in_table_info}|{include_image_columns}"
+
+def load_table_info(cache_key: str, cache_dir: Optional[str] = None) -> Optional[Dict[str, str]]:
+    """
+    Load cached table info.
+
+    Args:
+        cache_key: Key returned by make_cache_key.
+        cache_dir: Cache directory. Defaults to ~/.cache/nl2sql.
+
+    Returns:
+        Dictionary mapping table name to rendered table info, or None if not cached.
+    """
+    path = _cache_path(cache_key, cache_dir)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            table_info = json.load(f)
+        logger.info(f"Loaded cached schema for {len(table_info)} tables")
+        return table_info
+    except Exception as e:
+        logger.warning(f"Error loading cached schema: {e}")
+        return None
+
+def save_table_info(cache_key: str, table_info: Dict[str, str], cache_dir: Optional[str] = None) -> None:
+    """
+    Save table info to the cache.
+
+    Args:
+        cache_key: Key returned by make_cache_key.
+        table_info: Dictionary mapping table name to rendered table info.
+        cache_dir: Cache directory. Defaults to ~/.cache/nl2sql.
+    """
+    path = _cache_path(cache_key, cache_dir)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(table_info, f)
+    except Exception as e:
+        logger.warning(f"Error saving cached schema: {e}")
+
+def delete_table_info(cache_key: str, cache_dir: Optional[str] = None) -> None:
+    """
+    Delete cached table info, e.g. after a schema change.
+
+    Args:
+        cache_key: Key returned by make_cache_key.
+        cache_dir: Cache directory. Defaults to ~/.cache/nl2sql.
+    """
+    path = _cache_path(cache_key, cache_dir)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Error deleting cached schema: {e}")
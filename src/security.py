@@ -7,12 +7,77 @@ inputs and SQL queries.
 
 import re
 import logging
+import threading
 from typing import List, Dict, Any, Optional, Tuple, Union
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+class _HyperscanPatterns:
+    """
+    Case-insensitive multi-pattern matcher backed by a Hyperscan database.
+    
+    All patterns are compiled into a single automaton, so a scan is linear in the
+    length of the input regardless of the number of patterns. Hyperscan scratch
+    space can't be shared between threads, so each thread allocates its own.
+    """
+    
+    def __init__(self, patterns: List[str]):
+        self.database = hyperscan.Database()
+        self.database.compile(
+            expressions=[pattern.encode("utf-8") for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+        )
+        self._local = threading.local()
+    
+    def search(self, text: str) -> Optional[int]:
+        """
+        Scan text for the patterns.
+        
+        Args:
+            text: The text to scan.
+            
+        Returns:
+            Index of the first pattern found, or None if nothing matched.
+        """
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self.database)
+        
+        hits = []
+        
+        def on_match(pattern_id, start, end, flags, context):
+            hits.append(pattern_id)
+            # Stop scanning at the first match
+            return True
+        
+        try:
+            self.database.scan(text.encode("utf-8"), match_event_handler=on_match, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            pass
+        
+        return hits[0] if hits else None
+
+
+def _compile_hyperscan(patterns: List[str]) -> Optional[_HyperscanPatterns]:
+    """Compile patterns with Hyperscan, or return None to fall back to the re module."""
+    if hyperscan is None:
+        return None
+    
+    try:
+        return _HyperscanPatterns(patterns)
+    except Exception as e:
+        logger.warning(f"Error compiling Hyperscan database, falling back to re: {e}")
+        return None
+
+
 class SecurityValidator:
     """
     Validator for security concerns in natural language and SQL queries.
@@ -44,6 +109,16 @@ class SecurityValidator:
         'EXEC', 'EXECUTE', 'GRANT', 'REVOKE', 'DENY'
     ]
     
+    # Precompiled alternations so each check scans the query once.
+    # Every suspicious pattern gets its own group so match.lastindex identifies it.
+    _SUSPICIOUS_RE = re.compile('|'.join(f'({pattern})' for pattern in SUSPICIOUS_SQL_PATTERNS), re.IGNORECASE)
+    _DISALLOWED_RE = re.compile(r'\b(' + '|'.join(DISALLOWED_SQL_OPERATIONS) + r')\b', re.IGNORECASE)
+    
+    # Hyperscan databases used instead of the alternations when the optional
+    # hyperscan package is installed
+    _SUSPICIOUS_HS = _compile_hyperscan(SUSPICIOUS_SQL_PATTERNS)
+    _DISALLOWED_HS = _compile_hyperscan([rf'\b{operation}\b' for operation in DISALLOWED_SQL_OPERATIONS])
+    
     def __init__(self, read_only: bool = True):
         """
         Initialize the security validator.
@@ -66,10 +141,10 @@ class SecurityValidator:
         """
         # Check for suspicious SQL-like patterns in natural language
         # This is a basic check for attempts to inject SQL directly in NL
-        for operation in self.DISALLOWED_SQL_OPERATIONS:
-            if re.search(rf'\b{operation}\b', query, re.IGNORECASE):
-                logger.warning(f"Suspicious SQL operation '{operation}' detected in natural language query")
-                return False, f"Query contains suspicious operation: {operation}"
+        operation = self._find_disallowed_operation(query)
+        if operation:
+            logger.warning("Suspicious SQL operation '%s' detected in natural language query", operation)
+            return False, f"Query contains suspicious operation: {operation}"
         
         return True, None
     
@@ -85,20 +160,38 @@ class SecurityValidator:
             error_message describes the issue.
         """
         # Check for suspicious patterns
-        for pattern in self.SUSPICIOUS_SQL_PATTERNS:
-            if re.search(pattern, sql_query, re.IGNORECASE):
-                logger.warning(f"Suspicious SQL pattern detected: {pattern}")
-                return False, f"Query contains suspicious pattern: {pattern}"
+        pattern = self._find_suspicious_pattern(sql_query)
+        if pattern:
+            logger.warning("Suspicious SQL pattern detected: %s", pattern)
+            return False, f"Query contains suspicious pattern: {pattern}"
         
         # Check for disallowed operations in read-only mode
         if self.read_only:
-            for operation in self.DISALLOWED_SQL_OPERATIONS:
-                if re.search(rf'\b{operation}\b', sql_query, re.IGNORECASE):
-                    logger.warning(f"Disallowed SQL operation '{operation}' detected in read-only mode")
-                    return False, f"Operation not allowed in read-only mode: {operation}"
+            operation = self._find_disallowed_operation(sql_query)
+            if operation:
+                logger.warning("Disallowed SQL operation '%s' detected in read-only mode", operation)
+                return False, f"Operation not allowed in read-only mode: {operation}"
         
         return True, None
     
+    def _find_suspicious_pattern(self, query: str) -> Optional[str]:
+        """Get the first suspicious SQL pattern found in a query, if any."""
+        if self._SUSPICIOUS_HS is not None:
+            index = self._SUSPICIOUS_HS.search(query)
+            return None if index is None else self.SUSPICIOUS_SQL_PATTERNS[index]
+        
+        match = self._SUSPICIOUS_RE.search(query)
+        return self.SUSPICIOUS_SQL_PATTERNS[match.lastindex - 1] if match else None
+    
+    def _find_disallowed_operation(self, query: str) -> Optional[str]:
+        """Get the first disallowed SQL operation found in a query, if any."""
+        if self._DISALLOWED_HS is not None:
+            index = self._DISALLOWED_HS.search(query)
+            return None if index is None else self.DISALLOWED_SQL_OPERATIONS[index]
+        
+        match = self._DISALLOWED_RE.search(query)
+        return match.group(1).upper() if match else None
+    
     def sanitize_nl_input(self, query: str) -> str:
         """
         Basic sanitization of natural language input.
@@ -110,12 +203,7 @@ class SecurityValidator:
             Sanitized query.
         """
         # Replace SQL-like keywords with spaces to maintain query structure
-        sanitized_query = query
-        for operation in self.DISALLOWED_SQL_OPERATIONS:
-            pattern = rf'\b{operation}\b'
-            sanitized_query = re.sub(pattern, ' ' * len(operation), sanitized_query, flags=re.IGNORECASE)
-        
-        return sanitized_query
+        return self._DISALLOWED_RE.sub(lambda match: ' ' * len(match.group(0)), query)
     
     def audit_query(self, nl_query: str, sql_query: str, result_status: str) -> Dict[str, Any]:
         """
@@ -0,0 +1,238 @@
+"""
+Semantic cache for NL2SQL queries.
+
+This module provides a cache layer in front of the NL2SQL query function so that
+repeated or near-duplicate natural language queries can reuse a previous result
+instead of round-tripping to Azure OpenAI for SQL synthesis.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+from typing import Dict, List, Optional, Tuple, Any
+
+from .utils import DEFAULT_CACHE_DIR, looks_like_error
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Seconds a cached result stays valid; the underlying data changes over time
+DEFAULT_CACHE_TTL = 24 * 3600
+
+# Bump when the on-disk format changes so stale cache files are ignored
+CACHE_VERSION = 2
+
+# Number of nearest neighbours checked when the closest match has expired
+SEARCH_NEIGHBOURS = 4
+
+def make_cache_key(connection_string: str, included_tables: Optional[List[str]] = None) -> str:
+    """
+    Build the key identifying which database a semantic cache belongs to.
+
+    Args:
+        connection_string: Connection string of the database being queried.
+        included_tables: Tables exposed to the NL2SQL agent, if restricted.
+
+    Returns:
+        Cache key string; results for different databases or table sets never collide.
+    """
+    tables = ",".join(sorted(included_tables)) if included_tables else "*"
+    return f"{connection_string}|{tables}"
+
+class SemanticCachedFunction:
+    """
+    Wrapper around a Semantic Kernel function that caches results by query similarity.
+
+    Queries are embedded with a small local sentence-transformers model and looked up
+    in a FAISS inner-product index (cosine similarity on normalized embeddings). If
+    sentence-transformers or faiss are not installed, the cache falls back to exact
+    matching on the normalized query text.
+
+    Each cache is stored in files named after a hash of its cache key, so results
+    for different databases are kept apart, and entries expire after ttl seconds.
+    """
+
+    def __init__(self,
+                 kernel: Any,
+                 function: Any,
+                 cache_key: str = "",
+                 cache_dir: Optional[str] = None,
+                 similarity_threshold: float = 0.92,
+                 model_name: str = DEFAULT_EMBEDDING_MODEL,
+                 ttl: Optional[float] = DEFAULT_CACHE_TTL):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            kernel: The Semantic Kernel instance used to invoke the function on a cache miss.
+            function: The kernel function to wrap (e.g. NL2SQL query_database).
+            cache_key: Key identifying the database the function queries, see make_cache_key.
+            cache_dir: Directory used to persist the cache. Defaults to ~/.cache/nl2sql.
+            similarity_threshold: Minimum cosine similarity for a cache hit.
+            model_name: Name of the sentence-transformers model used for embeddings.
+            ttl: Seconds a cached result stays valid, or None to never expire.
+        """
+        self.kernel = kernel
+        self.function = function
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.similarity_threshold = similarity_threshold
+        self.model_name = model_name
+        self.ttl = ttl
+
+        self._queries: List[str] = []
+        self._results: List[str] = []
+        self._created: List[float] = []
+        self._exact: Dict[str, int] = {}
+        self._model = None
+        self._index = None
+
+        digest = hashlib.sha256(cache_key.encode("utf-8")).hexdigest()[:16]
+        self._index_path = os.path.join(self.cache_dir, f"semantic_cache-{digest}.faiss")
+        self._entries_path = os.path.join(self.cache_dir, f"semantic_cache-{digest}.json")
+
+        self._load_embedding_backend()
+        self._load()
+
+    def _load_embedding_backend(self):
+        """Load the embedding model and FAISS index if the optional packages are available."""
+        try:
+            import faiss
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            logger.info("sentence-transformers/faiss not installed; semantic cache uses exact matching only")
+            return
+
+        self._faiss = faiss
+        self._model = SentenceTransformer(self.model_name)
+        self._index = faiss.IndexFlatIP(self._model.get_sentence_embedding_dimension())
+
+    def _load(self):
+        """Load persisted cache entries from disk."""
+        if not os.path.exists(self._entries_path):
+            return
+
+        try:
+            with open(self._entries_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            if entries.get("version") != CACHE_VERSION:
+                logger.info("Semantic cache file has an old format; starting empty")
+                return
+
+            # Drop entries that expired while the cache was on disk
+            fresh = [i for i, created in enumerate(entries["created"]) if not self._is_expired(created)]
+            pruned = len(fresh) != len(entries["created"])
+            self._queries = [entries["queries"][i] for i in fresh]
+            self._results = [entries["results"][i] for i in fresh]
+            self._created = [entries["created"][i] for i in fresh]
+            self._exact = {query: i for i, query in enumerate(self._queries)}
+
+            if self._index is not None:
+                if os.path.exists(self._index_path) and not pruned:
+                    self._index = self._faiss.read_index(self._index_path)
+                if self._index.ntotal != len(self._results):
+                    # Index and entries are out of sync (or entries were pruned); rebuild the embeddings
+                    self._index.reset()
+                    if self._queries:
+                        self._index.add(self._embed(self._queries))
+
+            logger.info(f"Loaded {len(self._results)} entries from semantic cache")
+        except Exception as e:
+            logger.warning(f"Error loading semantic cache, starting empty: {e}")
+            self._queries, self._results, self._created, self._exact = [], [], [], {}
+            if self._index is not None:
+                self._index.reset()
+
+    def _save(self):
+        """Persist cache entries (and the FAISS index, if any) to disk."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._entries_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": CACHE_VERSION,
+                    "queries": self._queries,
+                    "results": self._results,
+                    "created": self._created,
+                }, f)
+            if self._index is not None:
+                self._faiss.write_index(self._index, self._index_path)
+        except Exception as e:
+            logger.warning(f"Error saving semantic cache: {e}")
+
+    def _is_expired(self, created: float) -> bool:
+        """Check whether an entry created at the given time has outlived the TTL."""
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    @staticmethod
+    def _normalize(query: str) -> str:
+        """Normalize a query for cache keying (case and whitespace insensitive)."""
+        return re.sub(r"\s+", " ", query.strip().lower())
+
+    def _embed(self, queries: List[str]):
+        """Embed queries as normalized float32 vectors so inner product is cosine similarity."""
+        return self._model.encode(queries, normalize_embeddings=True, convert_to_numpy=True).astype("float32")
+
+    def _lookup(self, normalized_query: str) -> Tuple[Optional[str], Any]:
+        """
+        Look up a normalized query in the cache.
+
+        Returns:
+            Tuple of (cached result or None, query embedding or None).
+        """
+        i = self._exact.get(normalized_query)
+        if i is not None and not self._is_expired(self._created[i]):
+            return self._results[i], None
+
+        if self._index is None:
+            return None, None
+
+        embedding = self._embed([normalized_query])
+        if self._index.ntotal:
+            scores, ids = self._index.search(embedding, min(SEARCH_NEIGHBOURS, self._index.ntotal))
+            # Neighbours come back best first; take the closest one that hasn't expired
+            for score, i in zip(scores[0], ids[0]):
+                if score < self.similarity_threshold:
+                    break
+                if not self._is_expired(self._created[i]):
+                    logger.info("Semantic cache hit (similarity %.3f)", score)
+                    return self._results[i], embedding
+
+        return None, embedding
+
+    async def invoke(self, query: str) -> str:
+        """
+        Invoke the wrapped function, returning a cached result for similar queries.
+
+        Args:
+            query: The natural language query to execute.
+
+        Returns:
+            The (possibly cached) result of the wrapped function as a string.
+        """
+        normalized_query = self._normalize(query)
+        cached_result, embedding = self._lookup(normalized_query)
+        if cached_result is not None:
+            return cached_result
+
+        result = str(await self.kernel.invoke(self.function, query=query))
+
+        # Don't cache failures so they are retried on the next run
+        if not looks_like_error(result):
+            i = self._exact.get(normalized_query)
+            if i is not None:
+                # Refresh the expired entry in place; its embedding is unchanged
+                self._results[i] = result
+                self._created[i] = time.time()
+            else:
+                self._exact[normalized_query] = len(self._results)
+                self._queries.append(normalized_query)
+                self._results.append(result)
+                self._created.append(time.time())
+                if self._index is not None:
+                    self._index.add(embedding)
+            self._save()
+
+        return result
@@ -3,19 +3,36 @@ Utility functions for the LangChain SQL Plugin.
 """
 
 import os
+import re
 import logging
-from typing import List, Dict, Any, Optional
+import functools
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 from dotenv import load_dotenv
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Directory for on-disk caches (semantic query cache, schema cache)
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nl2sql")
+
+# Environment variables that may be left unset
+OPTIONAL_ENV_VARS = ["azure_openai_fast_deployment_name", "included_tables", "read_only"]
+
+@functools.lru_cache(maxsize=1)
 def load_environment_variables() -> Dict[str, Any]:
     """
     Load environment variables from .env file and return them as a dictionary.
     
+    The result is memoized, so the .env file is only parsed once per process.
+    Callers must not modify the returned dictionary; use
+    load_environment_variables.cache_clear() to reload.
+    
     Returns:
         Dictionary containing environment variables.
     """
@@ -30,13 +47,14 @@ def load_environment_variables() -> Dict[str, Any]:
         "azure_openai_endpoint": os.getenv("AZURE_OPENAI_ENDPOINT"),
         "azure_openai_api_version": os.getenv("AZURE_OPENAI_API_VERSION"),
         "azure_openai_deployment_name": os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
+        "azure_openai_fast_deployment_name": os.getenv("AZURE_OPENAI_FAST_DEPLOYMENT_NAME"),
         "connection_string": os.getenv("AZURE_SQL_CONNECTION_STRING"),
         "included_tables": [t.strip() for t in os.getenv("INCLUDED_TABLES", "").split(",")] if os.getenv("INCLUDED_TABLES") else None,
         "read_only": read_only
     }
     
     # Check for missing required variables
-    missing_vars = [k for k, v in env_vars.items() if v is None and k not in ["included_tables", "read_only"]]
+    missing_vars = [k for k, v in env_vars.items() if v is None and k not in OPTIONAL_ENV_VARS]
     if missing_vars:
         logger.warning(f"Missing environment variables: {', '.join(missing_vars)}")
     
@@ -48,6 +66,46 @@ def load_environment_variables() -> Dict[str, Any]:
     
     return env_vars
 
+def looks_like_error(result: str) -> bool:
+    """
+    Check whether a result string is an error message from the NL2SQL plugins.
+    
+    Covers both the plugins' own "Error ..." messages and the LangChain agent's
+    "Agent stopped due to iteration limit or time limit." output.
+    
+    Args:
+        result: The string returned by an NL2SQL plugin function.
+        
+    Returns:
+        True if the result is an error message, False otherwise.
+    """
+    return result.lstrip().lower().startswith(("error", "agent stopped"))
+
+# Keywords stripped by sanitize_input (matched anywhere, case-insensitively).
+# Longer keywords come first so EXECUTE is replaced as a whole rather than as EXEC.
+DISALLOWED_KEYWORDS = [
+    "DROP", "DELETE", "TRUNCATE", "ALTER", "GRANT", "REVOKE", 
+    "EXEC", "EXECUTE", "xp_", "sp_"
+]
+_DISALLOWED_KEYWORDS_RE = re.compile(
+    "|".join(re.escape(keyword) for keyword in sorted(DISALLOWED_KEYWORDS, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+def _build_keywords_automaton():
+    """Build an Aho-Corasick automaton over the disallowed keywords, if pyahocorasick is installed."""
+    if ahocorasick is None:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for keyword in DISALLOWED_KEYWORDS:
+        automaton.add_word(keyword.lower(), keyword.upper())
+    automaton.make_automaton()
+    return automaton
+
+# Used instead of the regex when the optional pyahocorasick package is installed
+_DISALLOWED_KEYWORDS_AUTOMATON = _build_keywords_automaton()
+
 def sanitize_input(query: str) -> str:
     """
     Basic input sanitization for natural language queries.
@@ -63,17 +121,55 @@ def sanitize_input(query: str) -> str:
         Sanitized query.
     """
     # Remove any SQL-like statements or characters that might be injection attempts
-    disallowed_keywords = [
-        "DROP", "DELETE", "TRUNCATE", "ALTER", "GRANT", "REVOKE", 
-        "EXEC", "EXECUTE", "xp_", "sp_"
-    ]
-    
-    # Check for suspicious SQL-like patterns
-    sanitized_query = query
-    for keyword in disallowed_keywords:
-        if keyword in sanitized_query.upper():
-            logger.warning(f"Potentially suspicious keyword detected in query: {keyword}")
+    query_lower = query.lower() if _DISALLOWED_KEYWORDS_AUTOMATON is not None else None
+    if query_lower is not None and len(query_lower) == len(query):
+        sanitized_query, matches = _blank_keywords_with_automaton(query, query_lower)
+    else:
+        matches = set()
+        
+        def _blank(match):
+            matches.add(match.group(0).upper())
             # Replace with spaces to maintain query structure
-            sanitized_query = sanitized_query.upper().replace(keyword, " " * len(keyword)).lower()
+            return " " * len(match.group(0))
+        
+        sanitized_query = _DISALLOWED_KEYWORDS_RE.sub(_blank, query)
+    
+    if matches:
+        logger.warning("Potentially suspicious keywords detected in query: %s", ", ".join(sorted(matches)))
+    
+    return sanitized_query
+
+def _blank_keywords_with_automaton(query: str, query_lower: str) -> Tuple[str, Set[str]]:
+    """
+    Replace disallowed keywords with spaces using the Aho-Corasick automaton.
+    
+    Args:
+        query: The query to sanitize.
+        query_lower: The lowercased query (same length as query).
+        
+    Returns:
+        Tuple of (sanitized query, set of matched keywords).
+    """
+    matches = set()
+    spans = []
+    for end, keyword in _DISALLOWED_KEYWORDS_AUTOMATON.iter(query_lower):
+        matches.add(keyword)
+        spans.append((end - len(keyword) + 1, end + 1))
+    
+    if not spans:
+        return query, matches
+    
+    # Blank out the union of the matched spans, keeping everything else as-is
+    pieces = []
+    last = 0
+    for start, end in sorted(spans):
+        start = max(start, last)
+        if start >= end:
+            continue
+        pieces.append(query[last:start])
+        # Replace with spaces to maintain query structure
+        pieces.append(" " * (end - start))
+        last = end
+    pieces.append(query[last:])
     
-    return sanitized_query
\ No newline at end of file
+    return "".join(pieces), matches
\ No newline at end of file